@@ -0,0 +1,38 @@
+"""
+PDF page extraction used by the server's process pool.
+
+Kept separate from server.py so spawned pool processes only import PyMuPDF,
+not the Flask app, the Gemini client or the Redis connection.
+"""
+import logging
+from multiprocessing import shared_memory
+
+import fitz  # PyMuPDF
+
+logger = logging.getLogger(__name__)
+
+def extract_page_range(pdf, start, stop):
+    """Extract plain text from a contiguous range of pages of an open PDF"""
+    parts = []
+    for page_num in range(start, stop):
+        try:
+            # Plain "text" output skips the layout reconstruction we never use
+            page_text = pdf.load_page(page_num).get_text("text")
+        except Exception as e:
+            logger.error(f"Error extracting text from page {page_num + 1}: {e}")
+            continue
+
+        if page_text and not page_text.isspace():
+            parts.append(page_text)
+        else:
+            logger.warning(f"No text found on page {page_num + 1}")
+    return parts
+
+def extract_shared_page_range(shm_name, size, start, stop):
+    """Open a PDF held in shared memory and extract a contiguous range of its pages"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        with fitz.open(stream=bytes(shm.buf[:size]), filetype='pdf') as pdf:
+            return extract_page_range(pdf, start, stop)
+    finally:
+        shm.close()
@@ -1,30 +1,74 @@
 import os
-import json
+import re
+import orjson
+import time
+import hashlib
+import threading
+import multiprocessing
+from multiprocessing import shared_memory
 import requests
-import tempfile
-import mimetypes
-from flask import Flask, request, jsonify
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import io
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from flask import Flask, request, jsonify, url_for, stream_with_context
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import google.generativeai as genai
 from dotenv import load_dotenv
 import logging
-from urllib.parse import urlparse
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
 from werkzeug.utils import secure_filename
 
 # Document processing imports
-import pdfplumber
-from docx import Document
+import fitz  # PyMuPDF
+from pdf_worker import extract_page_range, extract_shared_page_range
+import zipfile
+from lxml import etree
 from striprtf.striprtf import rtf_to_text
+from charset_normalizer import from_bytes
+import magic
+import ijson
+
+# Optional shared cache and background job backend
+try:
+    import redis
+except ImportError:
+    redis = None
+
+try:
+    from rq import Queue
+    from rq.job import Job, JobStatus
+    from rq.exceptions import NoSuchJobError
+except ImportError:
+    Queue = None
 
 # Load environment variables from .env file
 load_dotenv()
 
 frontend_origin = os.getenv("FRONTEND_ORIGIN", "http://localhost:5173")
 
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson for faster request and response (de)serialization"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Build the body from orjson's bytes directly instead of round-tripping through str
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype="application/json")
+
 # Initialize Flask app
 app = Flask(__name__)
-CORS(app, origins=[frontend_origin])
+app.json = OrjsonProvider(app)
+CORS(app, origins=[frontend_origin], expose_headers=['ETag'])
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -41,13 +85,20 @@ except KeyError:
     print("Please add GOOGLE_API_KEY to your .env file.")
     print("="*50)
 
+# Shared model instance and generation config, reused by every request
+GEMINI_MODEL = genai.GenerativeModel('gemini-1.5-flash-latest')
+GEMINI_GENERATION_CONFIG = genai.types.GenerationConfig(
+    response_mime_type="application/json"
+)
+
 # File upload configuration
-UPLOAD_FOLDER = tempfile.gettempdir()
 MAX_CONTENT_LENGTH = 10 * 1024 * 1024  # 10MB
 app.config['MAX_CONTENT_LENGTH'] = MAX_CONTENT_LENGTH
 
 # Allowed file extensions and MIME types
 ALLOWED_EXTENSIONS = {'pdf', 'doc', 'docx', 'txt', 'rtf'}
+SUPPORTED_FORMATS = sorted(ALLOWED_EXTENSIONS)
+ALLOWED_EXTENSIONS_DISPLAY = ", ".join(SUPPORTED_FORMATS)
 ALLOWED_MIME_TYPES = {
     'application/pdf': 'pdf',
     'application/msword': 'doc', 
@@ -57,155 +108,374 @@ ALLOWED_MIME_TYPES = {
     'text/rtf': 'rtf'
 }
 
-def allowed_file(filename, content_type):
-    """Check if the uploaded file is allowed"""
-    if '.' not in filename:
-        return False
+# libmagic reports some Word files by their container format rather than the document type
+CONTAINER_MIME_TYPES = {
+    'application/zip': {'docx', 'doc'},
+    'application/x-ole-storage': {'doc'},
+    'application/CDFV2': {'doc'}
+}
+# Plain-text formats libmagic reports under application/*; accepted when uploaded as .txt
+STRUCTURED_TEXT_MIME_TYPES = {'application/json', 'application/xml', 'application/csv', 'application/x-ndjson'}
+MAGIC_SNIFF_BYTES = 2048
+
+# PDFs with at least this many pages per worker are extracted in parallel
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "16"))
+PDF_MAX_WORKERS = min(8, os.cpu_count() or 1)
+_pdf_executor = None
+_pdf_executor_lock = threading.Lock()
+
+# Batch analysis runs items on a shared thread pool so their model calls overlap
+MAX_BATCH_ITEMS = int(os.getenv("MAX_BATCH_ITEMS", "10"))
+batch_executor = ThreadPoolExecutor(max_workers=int(os.getenv("BATCH_MAX_WORKERS", "8")))
+
+# WordprocessingML elements read when streaming DOCX text
+WORD_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+DOCX_PARAGRAPH = f'{WORD_NAMESPACE}p'
+DOCX_ROW = f'{WORD_NAMESPACE}tr'
+DOCX_CELL = f'{WORD_NAMESPACE}tc'
+DOCX_RUN = f'{WORD_NAMESPACE}r'
+DOCX_TEXT = f'{WORD_NAMESPACE}t'
+DOCX_TAB = f'{WORD_NAMESPACE}tab'
+DOCX_BREAK = f'{WORD_NAMESPACE}br'
+DOCX_PARAGRAPH_PARENTS = {f'{WORD_NAMESPACE}body', DOCX_CELL, f'{WORD_NAMESPACE}sdtContent'}
+# Text boxes are skipped, as python-docx did; mc:Fallback repeats the content of mc:Choice
+DOCX_TEXT_BOX = f'{WORD_NAMESPACE}txbxContent'
+DOCX_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+DOCX_SKIPPED_TAGS = (DOCX_TEXT_BOX, DOCX_FALLBACK)
+DOCX_TEXT_TAGS = (DOCX_PARAGRAPH, DOCX_ROW, DOCX_TEXT, DOCX_TAB, DOCX_BREAK) + DOCX_SKIPPED_TAGS
+
+# Report cache configuration
+REPORT_CACHE_TTL = int(os.getenv("REPORT_CACHE_TTL", "86400"))  # 24 hours
+REPORT_CACHE_SIZE = int(os.getenv("REPORT_CACHE_SIZE", "256"))
+PROMPT_CACHE_SIZE = 512
+REDIS_URL = os.getenv("REDIS_URL")
+REPORT_HTTP_MAX_AGE = 3600  # 1 hour
+
+class LRUCache:
+    """Small thread-safe in-process LRU cache with per-entry expiry"""
+
+    def __init__(self, maxsize, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+# Serialized reports keyed by content hash, and raw model replies keyed by prompt hash
+report_cache = LRUCache(REPORT_CACHE_SIZE, ttl=REPORT_CACHE_TTL)
+prompt_cache = LRUCache(PROMPT_CACHE_SIZE, ttl=REPORT_CACHE_TTL)
+
+redis_client = None
+if REDIS_URL:
+    if redis is None:
+        logger.warning("REDIS_URL is set but the redis package is not installed; using in-process cache only")
+    else:
+        try:
+            redis_client = redis.Redis.from_url(REDIS_URL)
+            redis_client.ping()
+            logger.info("Redis report cache connected")
+        except Exception as e:
+            logger.warning(f"Redis unavailable, using in-process cache only: {e}")
+            redis_client = None
+
+# Background analysis jobs, processed by `rq worker analysis`
+ASYNC_JOB_TIMEOUT = int(os.getenv("ASYNC_JOB_TIMEOUT", "600"))
+ASYNC_RESULT_TTL = int(os.getenv("ASYNC_RESULT_TTL", "3600"))
+# Jobs are enqueued by dotted path so workers can import them even when the API runs as __main__
+DOCUMENT_JOB = 'server.run_document_job'
+URL_TEXT_JOB = 'server.run_url_text_job'
+job_queue = None
+if redis_client is not None and Queue is not None:
+    job_queue = Queue('analysis', connection=redis_client)
+
+def canonicalize_url(url: str) -> str:
+    """Normalize a URL so trivially different links to the same article share a cache entry"""
+    parsed = urlparse(url.strip())
+    query = urlencode([
+        (key, value) for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_')
+    ])
+    return urlunparse((parsed.scheme.lower(), parsed.netloc.lower(), parsed.path or '/', parsed.params, query, ''))
+
+def report_cache_key(kind: str, content: bytes) -> str:
+    """Build a cache key from the SHA-256 of the submitted content"""
+    return f"{kind}:{hashlib.sha256(content).hexdigest()}"
+
+def get_cached_report(cache_key: str) -> dict | None:
+    """Return a previously computed credibility report, checking memory first and then Redis"""
+    payload = report_cache.get(cache_key)
+    
+    if payload is None and redis_client is not None:
+        try:
+            payload = redis_client.get(f"cred:{cache_key}")
+        except Exception as e:
+            logger.warning(f"Redis lookup failed: {e}")
+        if payload is not None:
+            report_cache.set(cache_key, payload)
+    
+    if payload is None:
+        return None
+    
+    logger.info(f"Report cache hit: {cache_key}")
+    return orjson.loads(payload)
+
+def store_cached_report(cache_key: str, report: dict):
+    """Store a successful credibility report in memory and, when configured, in Redis"""
+    payload = orjson.dumps(report)
+    report_cache.set(cache_key, payload)
+    
+    if redis_client is not None:
+        try:
+            redis_client.setex(f"cred:{cache_key}", REPORT_CACHE_TTL, payload)
+        except Exception as e:
+            logger.warning(f"Redis store failed: {e}")
+
+def detect_file_type(file_data, filename):
+    """Sniff the upload's leading bytes with libmagic and map them to a supported file type"""
+    mime_type = magic.from_buffer(file_data[:MAGIC_SNIFF_BYTES], mime=True)
+    file_type = ALLOWED_MIME_TYPES.get(mime_type)
     
-    extension = filename.rsplit('.', 1)[1].lower()
-    mime_extension = ALLOWED_MIME_TYPES.get(content_type)
+    if file_type is None:
+        extension = filename.rsplit('.', 1)[1].lower() if '.' in filename else ''
+        if extension in CONTAINER_MIME_TYPES.get(mime_type, ()):
+            # Generic zip/OLE containers: only trust the extension if it names a format stored that way
+            file_type = extension
+        elif mime_type.startswith('text/') or (extension == 'txt' and mime_type in STRUCTURED_TEXT_MIME_TYPES):
+            file_type = 'txt'
     
-    return extension in ALLOWED_EXTENSIONS or mime_extension in ALLOWED_EXTENSIONS
+    return file_type, mime_type
 
-def extract_pdf_text(file_path):
-    """Extract text from PDF using pdfplumber"""
+def get_pdf_executor():
+    """Lazily create the process pool used for large PDFs"""
+    global _pdf_executor
+    with _pdf_executor_lock:
+        if _pdf_executor is None:
+            # Spawned workers avoid forking a multi-threaded server process; they only
+            # need to import pdf_worker, not this module
+            _pdf_executor = ProcessPoolExecutor(
+                max_workers=PDF_MAX_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pdf_executor
+
+def discard_pdf_executor(executor):
+    """Drop a broken process pool so the next large PDF gets a fresh one"""
+    global _pdf_executor
+    with _pdf_executor_lock:
+        # Another request may already have replaced it
+        if _pdf_executor is executor:
+            _pdf_executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+def extract_pdf_pages_in_pool(file_data, starts, stops):
+    """Extract page ranges on the process pool, rebuilding it once if a worker has died"""
+    # Workers read the upload from shared memory instead of each task pickling its own copy
+    shm = shared_memory.SharedMemory(create=True, size=len(file_data))
     try:
-        text_content = ""
-        with pdfplumber.open(file_path) as pdf:
-            logger.info(f"Processing PDF with {len(pdf.pages)} pages")
+        shm.buf[:len(file_data)] = file_data
+        task_count = len(starts)
+        
+        for attempt in range(2):
+            executor = get_pdf_executor()
+            try:
+                chunks = executor.map(
+                    extract_shared_page_range,
+                    [shm.name] * task_count, [len(file_data)] * task_count, starts, stops
+                )
+                return [page_text for chunk in chunks for page_text in chunk]
+            except BrokenProcessPool:
+                logger.warning("PDF worker process terminated abruptly, rebuilding the process pool")
+                discard_pdf_executor(executor)
+                # A second crash is most likely caused by this document, so don't retry it in-process
+                if attempt:
+                    raise
+    finally:
+        shm.close()
+        shm.unlink()
+
+def extract_pdf_text(file_data):
+    """Extract text from PDF using PyMuPDF, spreading large documents across worker processes"""
+    try:
+        with fitz.open(stream=file_data, filetype='pdf') as pdf:
+            page_count = pdf.page_count
+            logger.info(f"Processing PDF with {page_count} pages")
             
-            for page_num, page in enumerate(pdf.pages):
-                try:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text_content += page_text + "\n"
-                        logger.info(f"Extracted text from page {page_num + 1}")
-                    else:
-                        logger.warning(f"No text found on page {page_num + 1}")
-                except Exception as e:
-                    logger.error(f"Error extracting text from page {page_num + 1}: {e}")
-                    continue
+            workers = min(PDF_MAX_WORKERS, page_count // PDF_PARALLEL_MIN_PAGES)
+            if workers <= 1:
+                # Small documents are read from the already open handle
+                parts = extract_page_range(pdf, 0, page_count)
         
-        if not text_content.strip():
+        if workers > 1:
+            # MuPDF is not thread-safe, so pages are split into contiguous ranges per process
+            chunk_size = -(-page_count // workers)
+            starts = list(range(0, page_count, chunk_size))
+            stops = [min(start + chunk_size, page_count) for start in starts]
+            parts = extract_pdf_pages_in_pool(file_data, starts, stops)
+        
+        text_content = "\n".join(parts).strip()
+        
+        if not text_content:
             raise ValueError("No text could be extracted from the PDF. The document might be image-based or corrupted.")
         
-        return text_content.strip()
+        return text_content
         
     except Exception as e:
         logger.error(f"PDF extraction error: {e}")
         raise ValueError(f"Failed to extract text from PDF: {str(e)}")
 
-def extract_docx_text(file_path):
-    """Extract text from DOCX using python-docx"""
+def iter_docx_paragraphs(file_data):
+    """Yield paragraph and table-row text from a .docx by streaming word/document.xml"""
+    row_cells = []
+    runs = []
+    # Depth of text boxes / fallback blocks we are currently inside
+    skip_depth = 0
+    
+    with zipfile.ZipFile(io.BytesIO(file_data)) as archive, archive.open('word/document.xml') as document_xml:
+        for event, element in etree.iterparse(document_xml, events=('start', 'end'), tag=DOCX_TEXT_TAGS, resolve_entities=False):
+            tag = element.tag
+            
+            if tag in DOCX_SKIPPED_TAGS:
+                skip_depth += 1 if event == 'start' else -1
+                continue
+            if event == 'start' or skip_depth:
+                continue
+            
+            if tag == DOCX_TEXT:
+                if element.text:
+                    runs.append(element.text)
+            elif tag in (DOCX_TAB, DOCX_BREAK):
+                # Tab stops in paragraph properties share the w:tab name; only runs carry content
+                if element.getparent().tag == DOCX_RUN:
+                    runs.append('\t' if tag == DOCX_TAB else '\n')
+            elif tag == DOCX_PARAGRAPH:
+                parent_tag = element.getparent().tag
+                if parent_tag not in DOCX_PARAGRAPH_PARENTS:
+                    continue
+                
+                text = ''.join(runs)
+                runs = []
+                # isspace() checks in place instead of allocating a stripped copy per paragraph
+                if text and not text.isspace():
+                    if parent_tag == DOCX_CELL:
+                        row_cells.append(text)
+                    else:
+                        yield text
+            elif tag == DOCX_ROW:
+                if row_cells:
+                    yield ' '.join(row_cells)
+                row_cells = []
+            
+            if tag in (DOCX_PARAGRAPH, DOCX_ROW):
+                # Free processed elements so memory stays flat on large documents
+                element.clear()
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+
+def extract_docx_text(file_data):
+    """Extract text from DOCX by streaming its XML with lxml"""
     try:
-        doc = Document(file_path)
-        text_content = ""
-        
-        logger.info(f"Processing DOCX with {len(doc.paragraphs)} paragraphs")
+        parts = list(iter_docx_paragraphs(file_data))
         
-        for paragraph in doc.paragraphs:
-            if paragraph.text.strip():
-                text_content += paragraph.text + "\n"
+        logger.info(f"Processing DOCX with {len(parts)} paragraphs and table rows")
         
-        # Extract text from tables
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    if cell.text.strip():
-                        text_content += cell.text + " "
-                text_content += "\n"
+        text_content = "\n".join(parts).strip()
         
-        if not text_content.strip():
+        if not text_content:
             raise ValueError("No text could be extracted from the Word document.")
         
-        return text_content.strip()
+        return text_content
         
     except Exception as e:
         logger.error(f"DOCX extraction error: {e}")
         raise ValueError(f"Failed to extract text from Word document: {str(e)}")
 
-def extract_doc_text(file_path):
+def extract_doc_text(file_data):
     """Extract text from legacy DOC files (fallback method)"""
     try:
-        # For legacy .doc files, we'll try to use python-docx
-        # Note: python-docx primarily works with .docx files
+        # Legacy .doc files are only readable here when they are actually DOCX (zip) containers
         # For better .doc support, you might need python-docx2txt or antiword
-        doc = Document(file_path)
-        text_content = ""
+        parts = list(iter_docx_paragraphs(file_data))
+        text_content = "\n".join(parts).strip()
         
-        for paragraph in doc.paragraphs:
-            if paragraph.text.strip():
-                text_content += paragraph.text + "\n"
-        
-        if not text_content.strip():
+        if not text_content:
             raise ValueError("No text could be extracted from the DOC file. Please convert to DOCX format.")
         
-        return text_content.strip()
+        return text_content
         
     except Exception as e:
         logger.error(f"DOC extraction error: {e}")
         raise ValueError(f"Failed to extract text from DOC file: {str(e)}. Please try converting to DOCX format.")
 
-def extract_txt_text(file_path):
-    """Extract text from TXT files"""
+def extract_txt_text(file_data):
+    """Extract text from TXT files, detecting the encoding in a single pass"""
     try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as file:
-            text_content = file.read()
+        best_match = from_bytes(file_data).best()
         
-        if not text_content.strip():
-            raise ValueError("The text file appears to be empty.")
+        if best_match is None:
+            raise ValueError("Could not decode the text file. Please ensure it's a valid text file.")
         
-        return text_content.strip()
+        logger.info(f"Read TXT file with {best_match.encoding} encoding")
+        text_content = str(best_match).strip()
         
-    except UnicodeDecodeError:
-        # Try different encodings
-        encodings = ['latin-1', 'cp1252', 'iso-8859-1']
-        for encoding in encodings:
-            try:
-                with open(file_path, 'r', encoding=encoding) as file:
-                    text_content = file.read()
-                    logger.info(f"Successfully read TXT file with {encoding} encoding")
-                    return text_content.strip()
-            except:
-                continue
-        raise ValueError("Could not decode the text file. Please ensure it's a valid text file.")
+        if not text_content:
+            raise ValueError("The text file appears to be empty.")
+        
+        return text_content
         
     except Exception as e:
         logger.error(f"TXT extraction error: {e}")
         raise ValueError(f"Failed to read text file: {str(e)}")
 
-def extract_rtf_text(file_path):
+def extract_rtf_text(file_data):
     """Extract text from RTF files"""
     try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as file:
-            rtf_content = file.read()
+        rtf_content = file_data.decode('utf-8', errors='ignore')
         
-        text_content = rtf_to_text(rtf_content)
+        text_content = rtf_to_text(rtf_content).strip()
         
-        if not text_content.strip():
+        if not text_content:
             raise ValueError("No text could be extracted from the RTF file.")
         
-        return text_content.strip()
+        return text_content
         
     except Exception as e:
         logger.error(f"RTF extraction error: {e}")
         raise ValueError(f"Failed to extract text from RTF file: {str(e)}")
 
-def extract_text_from_document(file_path, file_extension, original_filename):
+def extract_text_from_document(file_data, file_extension, original_filename):
     """Main function to extract text from various document types"""
     logger.info(f"Extracting text from {file_extension.upper()} file: {original_filename}")
     
     try:
         if file_extension == 'pdf':
-            return extract_pdf_text(file_path)
+            return extract_pdf_text(file_data)
         elif file_extension == 'docx':
-            return extract_docx_text(file_path)
+            return extract_docx_text(file_data)
         elif file_extension == 'doc':
-            return extract_doc_text(file_path)
+            return extract_doc_text(file_data)
         elif file_extension == 'txt':
-            return extract_txt_text(file_path)
+            return extract_txt_text(file_data)
         elif file_extension == 'rtf':
-            return extract_rtf_text(file_path)
+            return extract_rtf_text(file_data)
         else:
             raise ValueError(f"Unsupported file type: {file_extension}")
     
@@ -213,6 +483,23 @@ def extract_text_from_document(file_path, file_extension, original_filename):
         logger.error(f"Text extraction failed for {original_filename}: {e}")
         raise
 
+# Shared HTTP session so repeated fetches reuse pooled connections and TLS sessions
+MAX_ARTICLE_BYTES = 5 * 1024 * 1024  # 5MB
+ARTICLE_CONTENT_TYPES = {'text/html', 'application/xhtml+xml'}
+http_session = requests.Session()
+_http_adapter = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(total=2, backoff_factor=0.3)
+)
+http_session.mount('http://', _http_adapter)
+http_session.mount('https://', _http_adapter)
+
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# Tags worth parsing when scraping an article; scripts, styles, media and SVG are skipped
+ARTICLE_STRAINER = SoupStrainer(['article', 'main', 'section', 'div', 'p', 'nav', 'footer', 'aside', 'header'])
+
 def fetch_article_text(url: str) -> str | None:
     """
     Fetches and extracts the main text content from a given news article URL.
@@ -233,10 +520,33 @@ def fetch_article_text(url: str) -> str | None:
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
+        with http_session.get(url, headers=headers, timeout=10, stream=True) as response:
+            response.raise_for_status()
+            
+            # Reject non-HTML and declared-oversized responses before downloading the body
+            content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+            if content_type not in ARTICLE_CONTENT_TYPES:
+                logger.warning(f"Unsupported content type for article: {content_type or 'unknown'}")
+                return None
+            
+            try:
+                declared_length = int(response.headers.get('Content-Length', 0))
+            except ValueError:
+                declared_length = 0
+            if declared_length > MAX_ARTICLE_BYTES:
+                logger.warning(f"Page declares {declared_length} bytes, over the {MAX_ARTICLE_BYTES // (1024*1024)}MB limit, skipping")
+                return None
+            
+            # Read one byte past the cap so oversized pages can be detected without buffering them
+            page_content = response.raw.read(MAX_ARTICLE_BYTES + 1, decode_content=True)
+        
+        if len(page_content) > MAX_ARTICLE_BYTES:
+            logger.warning(f"Page exceeds {MAX_ARTICLE_BYTES // (1024*1024)}MB limit, skipping")
+            return None
 
-        soup = BeautifulSoup(response.content, 'html.parser')
+        # Only build the tree for content containers; noise containers are kept so
+        # that paragraphs nested inside them can still be dropped below
+        soup = BeautifulSoup(page_content, 'lxml', parse_only=ARTICLE_STRAINER)
         
         # Remove unwanted elements
         for script in soup(["script", "style", "nav", "footer", "aside", "header"]):
@@ -250,7 +560,10 @@ def fetch_article_text(url: str) -> str | None:
         else:
             paragraphs = soup.find_all('p')
 
-        article_text = ' '.join([p.get_text().strip() for p in paragraphs if p.get_text().strip()])
+        # Read each paragraph once; collapsing whitespace afterwards also drops blank paragraphs.
+        # A get_text separator would split words at inline tags ("president 's"), so none is used.
+        article_text = ' '.join(p.get_text() for p in paragraphs)
+        article_text = WHITESPACE_PATTERN.sub(' ', article_text).strip()
 
         if len(article_text) < 200:
             logger.warning("Extracted text is very short. The page might have a paywall or complex structure.")
@@ -265,57 +578,125 @@ def fetch_article_text(url: str) -> str | None:
         logger.error(f"An error occurred during scraping: {e}")
         return None
 
-def call_gemini_api(prompt: str) -> str:
-    """Makes a live API call to the Google Gemini model."""
-    logger.info("Making LIVE GEMINI API CALL")
-    try:
-        model = genai.GenerativeModel('gemini-1.5-flash-latest')
-        generation_config = genai.types.GenerationConfig(
-            response_mime_type="application/json"
-        )
-        response = model.generate_content(prompt, generation_config=generation_config)
-        return response.text
-    except Exception as e:
-        logger.error(f"An error occurred during the API call: {e}")
-        return json.dumps({"error": "Failed to get a response from the AI model.", "details": str(e)})
+NDJSON_MIMETYPE = 'application/x-ndjson'
 
-def analyze_text_for_misinformation(article_text: str) -> dict:
-    """Analyzes a given text for signs of misinformation using a generative AI model."""
-    prompt_template = f"""
+# Longer inputs are truncated before analysis; credibility signals sit early in the text
+MAX_ANALYSIS_CHARS = int(os.getenv("MAX_ANALYSIS_CHARS", "24000"))
+
+# Constant parts of the analysis prompt; only the article text varies per request
+ANALYSIS_PROMPT_PREFIX = """
     You are an expert misinformation and propaganda analyst. Your task is to analyze the following text for manipulative language, logical fallacies, emotional triggers, and signs of bias.
 
     Based on the text provided below, perform a detailed analysis and return your findings as a JSON object with the following exact structure:
-    {{
+    {
       "credibility_score": <An integer score from 0 (completely untrustworthy) to 100 (highly credible)>,
       "summary_of_claims": "<A neutral, one-sentence summary of the main claims made in the text>",
-      "analysis": {{
+      "analysis": {
         "overall_assessment": "<A brief, overall assessment of the text's credibility and tone.>",
         "manipulative_techniques": [
-          {{
+          {
             "technique": "<The name of the manipulative technique found (e.g., 'Emotional Appeal', 'Sensationalism & Hype', 'Weak Appeal to Authority', 'Logical Fallacy')>",
             "explanation": "<A brief explanation of how this technique is being used in the text.>",
             "flagged_quote": "<The exact quote from the text that demonstrates this technique.>"
-          }}
+          }
         ]
-      }}
-    }}
+      }
+    }
 
     Analyze the following text:
     --- TEXT START ---
-    {article_text}
+    """
+ANALYSIS_PROMPT_SUFFIX = """
     --- TEXT END ---
     """
 
-    response_text = call_gemini_api(prompt_template)
+def prompt_cache_key(prompt: str) -> str:
+    """Hash a prompt so cached model replies don't keep the full prompt text alive"""
+    return hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+
+def call_gemini_api(prompt: str) -> str:
+    """Makes a live API call to the Google Gemini model, reusing replies for identical prompts."""
+    prompt_hash = prompt_cache_key(prompt)
+    cached_response = prompt_cache.get(prompt_hash)
+    if cached_response is not None:
+        logger.info("Reusing cached Gemini response for identical prompt")
+        return cached_response
+    
+    logger.info("Making LIVE GEMINI API CALL")
+    try:
+        response = GEMINI_MODEL.generate_content(prompt, generation_config=GEMINI_GENERATION_CONFIG)
+        return response.text
+    except Exception as e:
+        logger.error(f"An error occurred during the API call: {e}")
+        return orjson.dumps({"error": "Failed to get a response from the AI model.", "details": str(e)}).decode('utf-8')
+
+def stream_gemini_api(prompt: str):
+    """Yields the Google Gemini response text chunk by chunk, replaying cached replies for identical prompts."""
+    prompt_hash = prompt_cache_key(prompt)
+    cached_response = prompt_cache.get(prompt_hash)
+    if cached_response is not None:
+        logger.info("Reusing cached Gemini response for identical prompt")
+        yield cached_response
+        return
+    
+    logger.info("Making LIVE streaming GEMINI API CALL")
+    response = GEMINI_MODEL.generate_content(prompt, generation_config=GEMINI_GENERATION_CONFIG, stream=True)
+    for chunk in response:
+        yield chunk.text
+
+def truncate_for_analysis(text: str) -> str:
+    """Trim text to MAX_ANALYSIS_CHARS, preferring to cut at a sentence boundary"""
+    if len(text) <= MAX_ANALYSIS_CHARS:
+        return text
+    
+    cut = text.rfind('. ', 0, MAX_ANALYSIS_CHARS)
+    # Only honour the sentence boundary if it doesn't throw away most of the budget
+    if cut > MAX_ANALYSIS_CHARS // 2:
+        return text[:cut + 1]
+    return text[:MAX_ANALYSIS_CHARS]
 
+def build_analysis_prompt(article_text: str) -> tuple[str, str]:
+    """Truncate the text and wrap it in the analysis prompt, returning (prompt, analyzed_text)"""
+    analyzed_text = truncate_for_analysis(article_text)
+    if len(analyzed_text) < len(article_text):
+        logger.info(f"Truncated text from {len(article_text)} to {len(analyzed_text)} characters for analysis")
+    
+    return ANALYSIS_PROMPT_PREFIX + analyzed_text + ANALYSIS_PROMPT_SUFFIX, analyzed_text
+
+def analyze_text_for_misinformation(article_text: str) -> dict:
+    """Analyzes a given text for signs of misinformation using a generative AI model."""
+    prompt, analyzed_text = build_analysis_prompt(article_text)
+    response_text = call_gemini_api(prompt)
+    return parse_analysis_response(prompt, response_text, article_text, analyzed_text)
+
+def parse_analysis_response(prompt: str, response_text: str, article_text: str, analyzed_text: str) -> dict:
+    """Parse the model's JSON reply, caching it for the prompt only once it is a usable analysis"""
     try:
-        analysis_result = json.loads(response_text)
+        analysis_result = orjson.loads(response_text)
+        if isinstance(analysis_result, dict) and "error" not in analysis_result:
+            prompt_cache.set(prompt_cache_key(prompt), response_text)
+            analysis_result['original_text_length'] = len(article_text)
+            analysis_result['analyzed_text_length'] = len(analyzed_text)
         return analysis_result
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         logger.error(f"Error decoding JSON from AI response: {e}")
         logger.error(f"Raw response received: {response_text}")
         return {"error": "Failed to parse the analysis from the AI model.", "raw_response": response_text}
 
+def make_report_response(report: dict):
+    """Serialize a successful report with a strong ETag, answering matching If-None-Match with 304"""
+    body = orjson.dumps(report)
+    etag = hashlib.sha256(body).hexdigest()
+    
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(body, mimetype='application/json')
+    
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = f'public, max-age={REPORT_HTTP_MAX_AGE}'
+    return response
+
 @app.route('/analyze', methods=['POST'])
 def analyze():
     """Main analysis endpoint that handles URL, text, and document analysis"""
@@ -333,87 +714,210 @@ def analyze():
             'details': str(e)
         }), 500
 
+def read_uploaded_document():
+    """Validate the uploaded file and return ((file_data, filename, file_extension), None) or (None, error_response)"""
+    # Check if file is present
+    if 'file' not in request.files:
+        return None, (jsonify({'error': 'No file uploaded'}), 400)
+    
+    file = request.files['file']
+    
+    if file.filename == '':
+        return None, (jsonify({'error': 'No file selected'}), 400)
+    
+    filename = secure_filename(file.filename)
+    
+    # Read the upload once so identical documents can skip extraction and analysis
+    file_data = file.read()
+    
+    # Validate the actual content rather than the client-supplied name and content type
+    file_extension, mime_type = detect_file_type(file_data, filename)
+    if file_extension is None:
+        logger.warning(f"Rejected upload {filename} with detected content type {mime_type}")
+        return None, (jsonify({
+            'error': f'Unsupported content. Allowed types: {ALLOWED_EXTENSIONS_DISPLAY}'
+        }), 415)
+    
+    return (file_data, filename, file_extension), None
+
+def analyze_document(file_data, filename, file_extension):
+    """Extract and analyze an uploaded document, returning the report (or error body) with its HTTP status"""
+    cache_key = report_cache_key('document', file_data)
+    cached_report = get_cached_report(cache_key)
+    
+    if cached_report is not None:
+        cached_report['document_info']['filename'] = filename
+        cached_report['document_info']['file_type'] = file_extension
+        return cached_report, 200
+    
+    # Extract text from document
+    extracted_text = extract_text_from_document(file_data, file_extension, filename)
+    
+    # Validate extracted text length
+    if len(extracted_text) < 50:
+        return {
+            'error': 'Extracted text is too short for meaningful analysis. Please ensure the document contains readable text.'
+        }, 400
+    
+    logger.info(f"Successfully extracted {len(extracted_text)} characters from document")
+    
+    # Analyze the extracted text
+    credibility_report = analyze_text_for_misinformation(extracted_text)
+    
+    # Check if analysis was successful
+    if "error" in credibility_report:
+        return {
+            'error': 'Analysis failed',
+            'details': credibility_report
+        }, 500
+    
+    # Add metadata to the response
+    credibility_report['analysis_type'] = 'document'
+    credibility_report['document_info'] = {
+        'filename': filename,
+        'file_type': file_extension,
+        'text_length': len(extracted_text),
+        'content_preview': extracted_text[:200] + '...' if len(extracted_text) > 200 else extracted_text
+    }
+    store_cached_report(cache_key, credibility_report)
+    
+    logger.info("Document analysis completed successfully")
+    return credibility_report, 200
+
 def handle_document_analysis():
     """Handle document upload and analysis"""
     try:
-        # Check if file is present
-        if 'file' not in request.files:
-            return jsonify({'error': 'No file uploaded'}), 400
+        upload, error_response = read_uploaded_document()
+        if error_response:
+            return error_response
         
-        file = request.files['file']
+        report, status_code = analyze_document(*upload)
+        if status_code != 200:
+            return jsonify(report), status_code
         
-        if file.filename == '':
-            return jsonify({'error': 'No file selected'}), 400
-        
-        # Validate file type and size
-        if not allowed_file(file.filename, file.content_type):
-            return jsonify({
-                'error': f'File type not supported. Allowed types: {", ".join(ALLOWED_EXTENSIONS)}'
-            }), 400
+        return make_report_response(report)
+
+    except Exception as e:
+        logger.error(f"Document analysis error: {e}")
+        return jsonify({
+            'error': 'Failed to process document',
+            'details': str(e)
+        }), 500
+
+def prepare_url_or_text(analysis_type, content):
+    """Resolve the text to analyze for a URL or text request.
+    
+    Returns (text_to_analyze, cache_key, None), or (None, None, (body, status)) when the
+    request is answered early from the report cache or fails validation.
+    """
+    cache_key = None
+    
+    # Process based on type
+    if analysis_type == 'url':
+        logger.info(f"Processing URL analysis for: {content}")
+        cache_key = report_cache_key('url', canonicalize_url(content).encode('utf-8'))
+        cached_report = get_cached_report(cache_key)
         
-        # Get file extension
-        filename = secure_filename(file.filename)
-        file_extension = filename.rsplit('.', 1)[1].lower() if '.' in filename else ''
+        if cached_report is not None:
+            cached_report['original_input'] = content
+            return None, None, (cached_report, 200)
         
-        # Create temporary file
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=f'.{file_extension}')
-        temp_file_path = temp_file.name
+        article_content = fetch_article_text(content)
         
-        try:
-            # Save uploaded file
-            file.save(temp_file_path)
-            logger.info(f"File saved temporarily: {temp_file_path}")
-            
-            # Extract text from document
-            extracted_text = extract_text_from_document(temp_file_path, file_extension, filename)
-            
-            # Validate extracted text length
-            if len(extracted_text) < 50:
-                return jsonify({
-                    'error': 'Extracted text is too short for meaningful analysis. Please ensure the document contains readable text.'
-                }), 400
-            
-            logger.info(f"Successfully extracted {len(extracted_text)} characters from document")
-            
-            # Analyze the extracted text
-            credibility_report = analyze_text_for_misinformation(extracted_text)
-            
-            # Check if analysis was successful
-            if "error" in credibility_report:
-                return jsonify({
-                    'error': 'Analysis failed',
-                    'details': credibility_report
-                }), 500
+        if not article_content:
+            return None, None, ({
+                'error': 'Could not extract content from the provided URL. Please check the URL or try a different one.'
+            }, 400)
             
-            # Add metadata to the response
-            credibility_report['analysis_type'] = 'document'
-            credibility_report['document_info'] = {
-                'filename': filename,
-                'file_type': file_extension,
-                'text_length': len(extracted_text),
-                'content_preview': extracted_text[:200] + '...' if len(extracted_text) > 200 else extracted_text
-            }
-            
-            logger.info("Document analysis completed successfully")
-            return jsonify(credibility_report)
+        text_to_analyze = article_content
+        
+    elif analysis_type == 'text':
+        logger.info("Processing direct text analysis")
+        text_to_analyze = content
+        
+        if len(text_to_analyze.strip()) < 50:
+            return None, None, ({
+                'error': 'Text content is too short for meaningful analysis. Please provide at least 50 characters.'
+            }, 400)
             
-        finally:
-            # Clean up temporary file
-            try:
-                os.unlink(temp_file_path)
-                logger.info("Temporary file cleaned up")
-            except Exception as cleanup_error:
-                logger.warning(f"Failed to clean up temporary file: {cleanup_error}")
+    else:
+        return None, None, ({
+            'error': 'Invalid analysis type. Must be either "url" or "text"'
+        }, 400)
+    
+    return text_to_analyze, cache_key, None
+
+def finish_url_or_text_report(credibility_report, analysis_type, content, cache_key):
+    """Add request metadata to a successful URL or text report and cache it"""
+    credibility_report['analysis_type'] = analysis_type
+    credibility_report['original_input'] = content if analysis_type == 'url' else content[:200] + '...' if len(content) > 200 else content
+    
+    if cache_key:
+        store_cached_report(cache_key, credibility_report)
+    
+    logger.info("Analysis completed successfully")
+    return credibility_report
+
+def analyze_url_or_text(analysis_type, content):
+    """Run URL or text analysis and return the report (or error body) with its HTTP status"""
+    text_to_analyze, cache_key, early_result = prepare_url_or_text(analysis_type, content)
+    if early_result is not None:
+        return early_result
+
+    # Perform the analysis
+    logger.info("Starting credibility analysis")
+    credibility_report = analyze_text_for_misinformation(text_to_analyze)
+    
+    # Check if analysis was successful
+    if "error" in credibility_report:
+        return {
+            'error': 'Analysis failed',
+            'details': credibility_report
+        }, 500
+    
+    return finish_url_or_text_report(credibility_report, analysis_type, content, cache_key), 200
 
+def analyze_batch_item(item):
+    """Analyze a single batch entry, converting failures into per-item error bodies"""
+    if not isinstance(item, dict) or not item.get('type') or not item.get('data'):
+        return {
+            'error': 'Invalid batch item. Expected: {"type": "url|text", "data": "content"}'
+        }, 400
+    
+    try:
+        return analyze_url_or_text(str(item['type']).lower(), item['data'])
     except Exception as e:
-        logger.error(f"Document analysis error: {e}")
-        return jsonify({
-            'error': 'Failed to process document',
+        logger.error(f"Batch item analysis error: {e}")
+        return {
+            'error': 'Failed to process request',
             'details': str(e)
-        }), 500
+        }, 500
+
+def handle_batch_analysis(items):
+    """Analyze several URLs or texts concurrently so their model calls overlap"""
+    if not isinstance(items, list) or not items:
+        return jsonify({
+            'error': 'Invalid batch format. Expected: {"type": "batch", "items": [{"type": "url|text", "data": "content"}]}'
+        }), 400
+    
+    if len(items) > MAX_BATCH_ITEMS:
+        return jsonify({
+            'error': f'Too many batch items. Maximum is {MAX_BATCH_ITEMS}'
+        }), 400
+    
+    logger.info(f"Processing batch analysis with {len(items)} items")
+    results = []
+    for report, status_code in batch_executor.map(analyze_batch_item, items):
+        report['status'] = status_code
+        results.append(report)
+    
+    return jsonify({
+        'analysis_type': 'batch',
+        'results': results
+    })
 
 def handle_url_text_analysis():
-    """Handle URL and text analysis"""
+    """Handle URL, text and batch analysis"""
     try:
         data = request.get_json()
         
@@ -421,6 +925,10 @@ def handle_url_text_analysis():
             return jsonify({'error': 'No JSON data provided'}), 400
             
         analysis_type = data.get('type', '').lower()
+        
+        if analysis_type == 'batch':
+            return handle_batch_analysis(data.get('items'))
+        
         content = data.get('data', '')
         
         if not analysis_type or not content:
@@ -428,57 +936,220 @@ def handle_url_text_analysis():
                 'error': 'Invalid request format. Expected: {"type": "url|text", "data": "content"}'
             }), 400
 
-        # Process based on type
-        if analysis_type == 'url':
-            logger.info(f"Processing URL analysis for: {content}")
-            article_content = fetch_article_text(content)
-            
-            if not article_content:
-                return jsonify({
-                    'error': 'Could not extract content from the provided URL. Please check the URL or try a different one.'
-                }), 400
-                
-            text_to_analyze = article_content
-            
-        elif analysis_type == 'text':
-            logger.info("Processing direct text analysis")
-            text_to_analyze = content
-            
-            if len(text_to_analyze.strip()) < 50:
-                return jsonify({
-                    'error': 'Text content is too short for meaningful analysis. Please provide at least 50 characters.'
-                }), 400
-                
-        else:
+        report, status_code = analyze_url_or_text(analysis_type, content)
+        if status_code != 200:
+            return jsonify(report), status_code
+        
+        return make_report_response(report)
+
+    except Exception as e:
+        logger.error(f"URL/Text analysis error: {e}")
+        return jsonify({
+            'error': 'Failed to process request',
+            'details': str(e)
+        }), 500
+
+def ndjson_line(event: dict) -> bytes:
+    """Serialize one streaming event as a newline-delimited JSON record"""
+    return orjson.dumps(event) + b'\n'
+
+@app.route('/analyze/stream', methods=['POST'])
+def analyze_stream():
+    """Stream URL or text analysis as NDJSON, emitting the credibility score as soon as the model produces it"""
+    try:
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({'error': 'No JSON data provided'}), 400
+        
+        analysis_type = data.get('type', '').lower()
+        content = data.get('data', '')
+        
+        if analysis_type not in ('url', 'text') or not content:
             return jsonify({
-                'error': 'Invalid analysis type. Must be either "url" or "text"'
+                'error': 'Invalid request format. Expected: {"type": "url|text", "data": "content"}'
             }), 400
-
-        # Perform the analysis
-        logger.info("Starting credibility analysis")
-        credibility_report = analyze_text_for_misinformation(text_to_analyze)
         
-        # Check if analysis was successful
+        text_to_analyze, cache_key, early_result = prepare_url_or_text(analysis_type, content)
+        
+    except Exception as e:
+        logger.error(f"Streaming analysis error: {e}")
+        return jsonify({
+            'error': 'Failed to process request',
+            'details': str(e)
+        }), 500
+    
+    if early_result is not None:
+        report, status_code = early_result
+        if status_code != 200:
+            return jsonify(report), status_code
+        return app.response_class(ndjson_line({'event': 'report', 'report': report}), mimetype=NDJSON_MIMETYPE)
+    
+    prompt, analyzed_text = build_analysis_prompt(text_to_analyze)
+    
+    def generate():
+        chunks = []
+        # Incremental parser so the score can be sent before the rest of the report is generated
+        parser_events = ijson.sendable_list()
+        parser = ijson.parse_coro(parser_events)
+        
+        try:
+            for chunk_text in stream_gemini_api(prompt):
+                chunks.append(chunk_text)
+                yield ndjson_line({'event': 'chunk', 'text': chunk_text})
+                
+                if parser is None:
+                    continue
+                
+                try:
+                    parser.send(chunk_text.encode('utf-8'))
+                except ijson.JSONError as e:
+                    logger.warning(f"Incremental parse of AI response stopped: {e}")
+                    parser = None
+                    continue
+                
+                for prefix, event, value in parser_events:
+                    if prefix == 'credibility_score' and event == 'number':
+                        yield ndjson_line({'event': 'credibility_score', 'value': int(value)})
+                        parser = None
+                        break
+                del parser_events[:]
+                
+        except Exception as e:
+            logger.error(f"An error occurred during the streaming API call: {e}")
+            yield ndjson_line({
+                'event': 'error',
+                'error': 'Failed to get a response from the AI model.',
+                'details': str(e)
+            })
+            return
+        
+        credibility_report = parse_analysis_response(prompt, ''.join(chunks), text_to_analyze, analyzed_text)
+        
         if "error" in credibility_report:
-            return jsonify({
+            yield ndjson_line({
+                'event': 'error',
                 'error': 'Analysis failed',
                 'details': credibility_report
-            }), 500
+            })
+            return
         
-        # Add metadata to the response
-        credibility_report['analysis_type'] = analysis_type
-        credibility_report['original_input'] = content if analysis_type == 'url' else content[:200] + '...' if len(content) > 200 else content
+        finish_url_or_text_report(credibility_report, analysis_type, content, cache_key)
+        yield ndjson_line({'event': 'report', 'report': credibility_report})
+    
+    return app.response_class(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
+
+def run_document_job(file_data, filename, file_extension):
+    """Background job entry point for document analysis"""
+    try:
+        return analyze_document(file_data, filename, file_extension)
+    except Exception as e:
+        logger.error(f"Document analysis job error: {e}")
+        return {
+            'error': 'Failed to process document',
+            'details': str(e)
+        }, 500
+
+def run_url_text_job(analysis_type, content):
+    """Background job entry point for URL and text analysis"""
+    try:
+        return analyze_url_or_text(analysis_type, content)
+    except Exception as e:
+        logger.error(f"URL/Text analysis job error: {e}")
+        return {
+            'error': 'Failed to process request',
+            'details': str(e)
+        }, 500
+
+@app.route('/analyze/async', methods=['POST'])
+def analyze_async():
+    """Queue a URL, text, or document analysis and return a job id to poll"""
+    if job_queue is None:
+        return jsonify({
+            'error': 'Background analysis is not configured. Set REDIS_URL and run an RQ worker.'
+        }), 503
+    
+    try:
+        if request.content_type and 'multipart/form-data' in request.content_type:
+            upload, error_response = read_uploaded_document()
+            if error_response:
+                return error_response
+            
+            job = job_queue.enqueue(DOCUMENT_JOB, *upload, job_timeout=ASYNC_JOB_TIMEOUT, result_ttl=ASYNC_RESULT_TTL)
+        else:
+            data = request.get_json()
+            
+            if not data:
+                return jsonify({'error': 'No JSON data provided'}), 400
+            
+            analysis_type = data.get('type', '').lower()
+            content = data.get('data', '')
+            
+            if analysis_type not in ('url', 'text') or not content:
+                return jsonify({
+                    'error': 'Invalid request format. Expected: {"type": "url|text", "data": "content"}'
+                }), 400
+            
+            job = job_queue.enqueue(URL_TEXT_JOB, analysis_type, content, job_timeout=ASYNC_JOB_TIMEOUT, result_ttl=ASYNC_RESULT_TTL)
         
-        logger.info("Analysis completed successfully")
-        return jsonify(credibility_report)
+        logger.info(f"Queued analysis job {job.id}")
+        return jsonify({
+            'job_id': job.id,
+            'status': 'queued',
+            'result_url': url_for('analysis_result', job_id=job.id)
+        }), 202
 
     except Exception as e:
-        logger.error(f"URL/Text analysis error: {e}")
+        logger.error(f"Failed to queue analysis job: {e}")
         return jsonify({
-            'error': 'Failed to process request',
+            'error': 'Failed to queue analysis',
             'details': str(e)
         }), 500
 
+@app.route('/analyze/result/<job_id>', methods=['GET'])
+def analysis_result(job_id):
+    """Poll a queued analysis job, returning the report once it has finished"""
+    if job_queue is None:
+        return jsonify({
+            'error': 'Background analysis is not configured. Set REDIS_URL and run an RQ worker.'
+        }), 503
+    
+    try:
+        job = Job.fetch(job_id, connection=redis_client)
+    except NoSuchJobError:
+        return jsonify({'error': 'Job not found or expired'}), 404
+    
+    # The Redis instance may hold other RQ jobs; only expose ones from our queue
+    if job.origin != job_queue.name:
+        return jsonify({'error': 'Job not found or expired'}), 404
+    
+    status = job.get_status()
+    
+    if status == JobStatus.FINISHED:
+        result = job.result
+        if not (isinstance(result, (tuple, list)) and len(result) == 2):
+            logger.error(f"Analysis job {job_id} returned an unexpected result")
+            return jsonify({
+                'error': 'Analysis job returned an unexpected result',
+                'job_id': job_id
+            }), 500
+        
+        report, status_code = result
+        if status_code != 200:
+            return jsonify(report), status_code
+        return make_report_response(report)
+    
+    if status == JobStatus.FAILED:
+        return jsonify({
+            'error': 'Analysis job failed',
+            'job_id': job_id
+        }), 500
+    
+    return jsonify({
+        'job_id': job_id,
+        'status': status
+    }), 202
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
@@ -489,7 +1160,7 @@ def health_check():
             'status': 'healthy',
             'service': 'Credibility Analyzer API',
             'api_configured': api_configured,
-            'supported_formats': list(ALLOWED_EXTENSIONS),
+            'supported_formats': SUPPORTED_FORMATS,
             'max_file_size': f"{MAX_CONTENT_LENGTH // (1024*1024)}MB"
         })
     except Exception as e:
@@ -506,14 +1177,17 @@ def root():
         'version': '2.0.0',
         'description': 'Advanced AI-powered tool for detecting misinformation and analyzing content credibility',
         'endpoints': {
-            '/analyze': 'POST - Analyze text, URL, or document for credibility',
+            '/analyze': 'POST - Analyze text, URL, document, or a batch of URLs/texts for credibility',
+            '/analyze/stream': 'POST - Analyze text or URL, streaming progress as NDJSON events',
+            '/analyze/async': 'POST - Queue a text, URL, or document analysis and return a job id',
+            '/analyze/result/<job_id>': 'GET - Poll a queued analysis for its report',
             '/health': 'GET - Health check',
             '/': 'GET - API information'
         },
         'supported_formats': {
             'text': 'Direct text input',
             'url': 'Web articles and news content',
-            'documents': list(ALLOWED_EXTENSIONS)
+            'documents': SUPPORTED_FORMATS
         },
         'usage': {
             'url_analysis': {
@@ -532,6 +1206,17 @@ def root():
                     'data': 'Your text content here...'
                 }
             },
+            'batch_analysis': {
+                'method': 'POST',
+                'endpoint': '/analyze',
+                'body': {
+                    'type': 'batch',
+                    'items': [
+                        {'type': 'url', 'data': 'https://example.com/article'},
+                        {'type': 'text', 'data': 'Your text content here...'}
+                    ]
+                }
+            },
             'document_analysis': {
                 'method': 'POST',
                 'endpoint': '/analyze',